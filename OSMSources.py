@@ -0,0 +1,234 @@
+#!/usr/bin/env python
+"""
+OSMSources.py: registry of tile servers used by createMap.py
+Copyright (C) 2015 Frank Abelbeck <frank.abelbeck@googlemail.com>
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+#
+# Tile sources are either built-in (see BUILTIN below) or read from an INI
+# style configuration file. Each section defines one source, e.g.
+#
+#   [osm_retina]
+#   url         = https://{s}.tile.example.org/{z}/{x}/{y}@2x.png
+#   subdomains  = a,b,c
+#   tilesize    = 512
+#   format      = PNG
+#   maxzoom     = 19
+#   concurrency = 4
+#   rate        = 10
+#
+# Subdomains are given as a comma-separated list ("a,b,c" or "a1,a2"); a value
+# without commas is a single subdomain. Only "url" is mandatory. A section named
+# like a built-in source overrides the built-in definition; unspecified keys
+# keep the built-in values.
+#
+
+import configparser
+import threading
+import time
+import PIL.Image
+
+DEFAULT_SUBDOMAINS  = "a,b,c"
+DEFAULT_TILESIZE    = 256
+DEFAULT_MAXZOOM     = 18
+DEFAULT_CONCURRENCY = 2
+DEFAULT_RATE        = 0 # requests per second; 0 = unlimited
+
+# common spellings of image formats which differ from PIL's format names
+FORMAT_ALIASES = {
+	"JPG": "JPEG",
+	"TIF": "TIFF",
+}
+
+DFS_WARNING = """WARNING!
+
+Always use the official ICAO charts published by the Deutsche Flugsicherung
+as basis for aeronautical navigation!
+
+YOU HAVE BEEN WARNED!
+"""
+
+
+def checkFormat(format):
+	"""Returns the PIL image format name for the given format.
+
+Args:
+	format - image format name, e.g. "PNG" or "JPG" (string)
+
+Returns:
+	a string
+
+Raises:
+	ValueError - format not supported by PIL"""
+	format = format.upper()
+	format = FORMAT_ALIASES.get(format,format)
+	PIL.Image.init()
+	if format not in PIL.Image.ID:
+		raise ValueError("unknown image format '{0}'".format(format))
+	return format
+
+
+class TileSource:
+	"""Description of a tile server.
+
+Attributes:
+	name        - keyword of this source (string)
+	url         - URL scheme with placeholders {z}, {x}, {y} and optionally {s}
+	subdomains  - subdomains rotated into placeholder {s}; either a sequence or a
+	              comma-separated string ("a,b,c")
+	tilesize    - edge length of a (square) tile in pixels (integer)
+	format      - PIL image format name of the tiles, e.g. "PNG" (string or None)
+	maxzoom     - highest zoom level offered by the server (integer)
+	concurrency - maximum number of simultaneous downloads (integer, >= 1)
+	rate        - maximum number of requests per second (float; 0 = unlimited)
+	warning     - text to print before using this source (string or None)
+
+Raises:
+	ValueError - invalid tile size, format or maximum zoom"""
+
+	def __init__(self,name,url,subdomains=DEFAULT_SUBDOMAINS,tilesize=DEFAULT_TILESIZE,format=None,
+			maxzoom=DEFAULT_MAXZOOM,concurrency=DEFAULT_CONCURRENCY,rate=DEFAULT_RATE,warning=None):
+		self.name        = name
+		self.url         = url
+		if isinstance(subdomains,str):
+			subdomains = [s.strip() for s in subdomains.split(",") if s.strip()]
+		self.subdomains  = tuple(subdomains) if len(subdomains) > 0 else ("",)
+		self.tilesize    = int(tilesize)
+		if self.tilesize < 1:
+			raise ValueError("invalid tile size {0}".format(self.tilesize))
+		self.format      = checkFormat(format) if format else None
+		self.maxzoom     = int(maxzoom)
+		if self.maxzoom < 0:
+			raise ValueError("invalid maximum zoom {0}".format(self.maxzoom))
+		self.concurrency = max(1,int(concurrency))
+		self.rate        = max(0.0,float(rate))
+		self.warning     = warning
+		self._lock       = threading.Lock()
+		self._next       = 0.0
+
+	def tileURL(self,zoom,x,y):
+		"""Returns the download URL of the given tile.
+
+Subdomains are assigned round-robin based on the tile coordinates, so a given
+tile is always requested from the same mirror.
+
+Args:
+	zoom - zoom level (integer)
+	x    - x tile coordinate (integer)
+	y    - y tile coordinate (integer)
+
+Returns:
+	a string"""
+		s = self.subdomains[(x + y) % len(self.subdomains)]
+		return self.url.format(s=s,z=zoom,x=x,y=y)
+
+	def cacheURL(self,zoom,x,y):
+		"""Returns the URL used to identify the given tile in the cache.
+
+Always uses the first subdomain, so cached tiles do not depend on the mirror
+they were downloaded from.
+
+Args:
+	zoom - zoom level (integer)
+	x    - x tile coordinate (integer)
+	y    - y tile coordinate (integer)
+
+Returns:
+	a string"""
+		return self.url.format(s=self.subdomains[0],z=zoom,x=x,y=y)
+
+	def throttle(self):
+		"""Blocks until the next request is allowed by the rate limit.
+
+Thread-safe; may be called by several download threads."""
+		if self.rate <= 0: return
+		with self._lock:
+			now = time.monotonic()
+			wait = self._next - now
+			self._next = max(now,self._next) + 1 / self.rate
+		if wait > 0: time.sleep(wait)
+
+
+BUILTIN = {
+	"osm":         TileSource("osm","http://tile.openstreetmap.de/tiles/osmde/{z}/{x}/{y}.png",format="PNG"),
+	"topo":        TileSource("topo","http://opentopomap.org/{z}/{x}/{y}.png",format="PNG",maxzoom=17),
+	"cycle":       TileSource("cycle","http://{s}.tile2.opencyclemap.org/transport/{z}/{x}/{y}.png",format="PNG"),
+	"tonerhybrid": TileSource("tonerhybrid","http://{s}.tile.stamen.com/toner-hybrid/{z}/{x}/{y}.png",format="PNG"),
+	"watercolor":  TileSource("watercolor","http://{s}.tile.stamen.com/watercolor/{z}/{x}/{y}.png",subdomains="c,a,b",format="PNG"),
+	"hillshading": TileSource("hillshading","http://{s}.tiles.wmflabs.org/hillshading/{z}/{x}/{y}.png",subdomains="c,a,b",format="PNG"),
+	"seamark":     TileSource("seamark","http://tiles.openseamap.org/seamark/{z}/{x}/{y}.png",format="PNG"),
+	"hybrid":      TileSource("hybrid","http://korona.geog.uni-heidelberg.de/tiles/hybrid/x={x}&y={y}&z={z}"),
+	"esri_topo":   TileSource("esri_topo","https://services.arcgisonline.com/ArcGIS/rest/services/World_Topo_Map/MapServer/tile/{z}/{y}/{x}.jpg",format="JPEG"),
+	"esri_sat":    TileSource("esri_sat","https://server.arcgisonline.com/ArcGIS/rest/services/World_Imagery/MapServer/tile/{z}/{y}/{x}.jpg",format="JPEG"),
+	"esri_natgeo": TileSource("esri_natgeo","https://services.arcgisonline.com/ArcGIS/rest/services/NatGeo_World_Map/MapServer/tile/{z}/{y}/{x}.jpg",format="JPEG",maxzoom=16),
+	"terrain":     TileSource("terrain","https://stamen-tiles-{s}.a.ssl.fastly.net/terrain/{z}/{x}/{y}.png",subdomains="d,a,b,c",format="PNG"),
+	"dfs":         TileSource("dfs","https://ais.dfs.de/static-maps/icao500/tiles/{z}/{x}/{y}.png",format="PNG",warning=DFS_WARNING),
+}
+
+
+def loadSources(filename=None):
+	"""Returns a dictionary of all known tile sources.
+
+The built-in sources are merged with the sources defined in the given
+configuration file (if any); see the comment at the top of this module.
+
+Args:
+	filename - name of an INI style configuration file (string or None)
+
+Returns:
+	a dictionary mapping keywords (strings) to TileSource objects
+
+Raises:
+	configparser.Error - invalid configuration file
+	ValueError         - invalid value in configuration file"""
+	sources = dict(BUILTIN)
+	if filename is None: return sources
+	config = configparser.ConfigParser(interpolation=None)
+	config.read(filename)
+	for name in config.sections():
+		section = config[name]
+		base = sources.get(name)
+		if base is None:
+			if "url" not in section:
+				raise configparser.NoOptionError("url",name)
+			base = TileSource(name,section["url"])
+		sources[name] = TileSource(
+			name,
+			section.get("url",base.url),
+			subdomains  = section.get("subdomains",",".join(base.subdomains)),
+			tilesize    = section.getint("tilesize",base.tilesize),
+			format      = section.get("format",base.format),
+			maxzoom     = section.getint("maxzoom",base.maxzoom),
+			concurrency = section.getint("concurrency",base.concurrency),
+			rate        = section.getfloat("rate",base.rate),
+			warning     = section.get("warning",base.warning),
+		)
+	return sources
+
+
+def getSource(name,sources):
+	"""Returns the tile source for the given keyword or URL scheme.
+
+Args:
+	name    - keyword of a known source or an URL scheme (string)
+	sources - dictionary of known sources, cf. loadSources()
+
+Returns:
+	a TileSource object"""
+	try:
+		return sources[name]
+	except KeyError:
+		return TileSource("custom",name)
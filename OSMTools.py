@@ -152,13 +152,14 @@ Returns:
 	return lat_to_y(PRIME_MERIDIAN,zoom)
 
 
-def resolution(zoom,lat=0):
+def resolution(zoom,lat=0,tilesize=256):
 	"""Calculates the resolution of a raster map in m/px at given zoom and latitude.
 
 Args:
-	zoom - zoom level (integer, 0..18)
-	lat  - latitude given in degrees (float; <0 south of equator)
+	zoom     - zoom level (integer, 0..18)
+	lat      - latitude given in degrees (float; <0 south of equator)
+	tilesize - edge length of a tile in pixels (integer, default 256)
 
 Returns:
 	a float"""
-	return 40075.016686 * 1000 * math.cos(math.radians(lat)) / (2**(zoom+8))
+	return 40075.016686 * 1000 * math.cos(math.radians(lat)) / (2**zoom * tilesize)
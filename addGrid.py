@@ -35,16 +35,16 @@ if __name__ == "__main__":
 	)
 	parser.add_argument("--steps",default=1,type=float,help="number of steps between integer meridians/parallels [float]")
 	parser.add_argument("--special",action='store_true',help="add visible topics and polar circles (special parallels)")
-	parser.add_argument("ZOOM",type=int,help="zoom factor (0..18)")
-	parser.add_argument("X0",type=int,help="upper left tile (x coordinate)")
-	parser.add_argument("Y0",type=int,help="upper left tile (y coordinate)")
-	parser.add_argument("NX",type=int,help="width of map (number of tiles)")
-	parser.add_argument("NY",type=int,help="height of map (number of tiles)")
+	parser.add_argument("ZOOM",type=int,help="zoom factor (>= 0; upper limit depends on the tile source)")
+	parser.add_argument("X0",type=float,help="upper left tile (x coordinate); may be fractional")
+	parser.add_argument("Y0",type=float,help="upper left tile (y coordinate); may be fractional")
+	parser.add_argument("NX",type=float,help="width of map (number of tiles); may be fractional")
+	parser.add_argument("NY",type=float,help="height of map (number of tiles); may be fractional")
 	parser.add_argument("FILE",help="name of the SVG file")
 	args = parser.parse_args()
 	
 	# check zoom factor
-	if args.ZOOM < 0 or args.ZOOM > 18:
+	if args.ZOOM < 0:
 		print("Invalid zoom factor!")
 		sys.exit(1)
 	
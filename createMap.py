@@ -21,11 +21,29 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 #  - https://github.com/sjev/mapCreator
 #  - https://wiki.openstreetmap.org/wiki/Slippy_map_tilenames
 
-import sys,os,argparse,time
-import OSMTools
+import sys,os,argparse,configparser,concurrent.futures,hashlib,json,email.utils
+import OSMTools,OSMSources
 import urllib.request,urllib.parse
 import PIL.Image
 
+# paper sizes in millimetres (portrait orientation)
+PAPER = {
+	"A0": (841,1189),
+	"A1": (594,841),
+	"A2": (420,594),
+	"A3": (297,420),
+	"A4": (210,297),
+	"A5": (148,210),
+	"A6": (105,148),
+	"LETTER": (215.9,279.4),
+	"LEGAL": (215.9,355.6),
+}
+
+RESAMPLE = {
+	"box": PIL.Image.BOX,
+	"lanczos": PIL.Image.LANCZOS,
+}
+
 
 def scaleBytes(n):
 	if n > 2**40: #1649267441664:
@@ -41,6 +59,158 @@ def scaleBytes(n):
 	return "{:.2f}".format(num).rstrip("0").rstrip("."),unit
 
 
+def downloadTile(source,url,pathname):
+	"""Downloads a tile and stores it in the cache.
+
+If the tile is already cached, the request is made conditional on the file's
+modification time, so unchanged tiles are not transferred again.
+
+Args:
+	source   - tile source (OSMSources.TileSource); used for rate limiting
+	url      - URL of the tile (string)
+	pathname - path name of the cached tile file (string)
+
+Returns:
+	number of downloaded bytes (integer) or None if the tile was not modified
+
+Raises:
+	urllib.error.URLError - request failed
+	ValueError            - invalid URL
+	TypeError             - no data was received
+	ConnectionResetError  - connection reset by peer"""
+	os.makedirs(os.path.dirname(pathname),exist_ok=True)
+	request = urllib.request.Request(url)
+	try:
+		mtime = os.path.getmtime(pathname)
+		request.add_header("If-Modified-Since",email.utils.formatdate(mtime,usegmt=True))
+	except OSError:
+		pass
+	source.throttle()
+	try:
+		imgbytes = urllib.request.urlopen(request).read()
+	except urllib.error.HTTPError as e:
+		if e.code == 304: return None
+		raise
+	if len(imgbytes) == 0:
+		raise TypeError
+	with open(pathname,"wb") as f:
+		f.write(imgbytes)
+	return len(imgbytes)
+
+
+def paperSize(paper,landscape=False):
+	"""Returns the dimensions of the given paper size in millimetres.
+
+Args:
+	paper     - name of a paper size (cf. PAPER) or "WIDTHxHEIGHT" in mm (string)
+	landscape - if True, return the larger dimension as width (boolean)
+
+Returns:
+	a tuple of two floats (width,height)
+
+Raises:
+	ValueError - unknown paper size"""
+	try:
+		pw,ph = PAPER[paper.upper()]
+	except KeyError:
+		pw,ph = [float(i) for i in paper.lower().split("x")]
+	if landscape:
+		pw,ph = max(pw,ph),min(pw,ph)
+	return pw,ph
+
+
+def placeTile(x,y,tilesize,crop,size):
+	"""Calculates where a tile has to be pasted into a scaled and cropped map.
+
+The crop box is given in global pixel coordinates of the zoom level, i.e. tile
+coordinates multiplied by the tile size. Tile borders are rounded to target
+pixels, so neighbouring tiles share their borders without gaps.
+
+Args:
+	x        - x tile coordinate (integer)
+	y        - y tile coordinate (integer)
+	tilesize - edge length of a tile in pixels (integer)
+	crop     - region of the map (left,top,right,bottom) in global pixels (floats)
+	size     - dimensions of the map image (width,height) in pixels (integers)
+
+Returns:
+	a tuple (region,box) with the target region (left,top,right,bottom) in map
+	image pixels and the corresponding source box in tile pixels, or None if
+	the tile is not part of the map image"""
+	sx = size[0] / (crop[2] - crop[0])
+	sy = size[1] / (crop[3] - crop[1])
+	left   = max(0,      round((x * tilesize - crop[0]) * sx))
+	right  = min(size[0],round(((x + 1) * tilesize - crop[0]) * sx))
+	top    = max(0,      round((y * tilesize - crop[1]) * sy))
+	bottom = min(size[1],round(((y + 1) * tilesize - crop[1]) * sy))
+	if right <= left or bottom <= top:
+		return None
+	# source box in tile pixels; rounding of the target region may reach
+	# slightly beyond the tile, so the box is clamped to the tile
+	box = (
+		min(max(0,left   / sx + crop[0] - x * tilesize),tilesize),
+		min(max(0,top    / sy + crop[1] - y * tilesize),tilesize),
+		min(max(0,right  / sx + crop[0] - x * tilesize),tilesize),
+		min(max(0,bottom / sy + crop[1] - y * tilesize),tilesize),
+	)
+	return (left,top,right,bottom),box
+
+
+def hashFile(pathname):
+	"""Returns the SHA-1 hex digest of the contents of the given file.
+
+Args:
+	pathname - path name of the file (string)
+
+Returns:
+	a string
+
+Raises:
+	FileNotFoundError - file does not exist"""
+	with open(pathname,"rb") as f:
+		return hashlib.sha1(f.read()).hexdigest()
+
+
+def readManifest(filename):
+	"""Reads the manifest of a previously rendered map image.
+
+Args:
+	filename - name of the manifest file (string)
+
+Returns:
+	a dictionary with keys "parameters", "output" and "tiles", or None if the
+	manifest does not exist or is invalid"""
+	try:
+		with open(filename) as f:
+			manifest = json.load(f)
+		if all(key in manifest for key in ("parameters","output","tiles")):
+			return manifest
+	except (OSError,ValueError):
+		pass
+	return None
+
+
+def writeManifest(filename,parameters,imgfilename,hashes):
+	"""Writes the manifest of a rendered map image.
+
+The manifest records the render parameters, size and modification time of the
+map image and the content hash of each tile, keyed "zoom/x/y".
+
+Args:
+	filename    - name of the manifest file (string)
+	parameters  - render parameters (dictionary, JSON serialisable)
+	imgfilename - name of the map image file (string)
+	hashes      - dictionary mapping (zoom,x,y) tuples to content hashes"""
+	stat = os.stat(imgfilename)
+	manifest = {
+		"parameters": parameters,
+		"output": [stat.st_size,stat.st_mtime_ns],
+		"tiles": {"{0}/{1}/{2}".format(*tile): h for tile,h in hashes.items()},
+	}
+	with open(filename,"w") as f:
+		json.dump(manifest,f,indent="\t",sort_keys=True)
+
+
 if __name__ == "__main__":
 	
 	# obtain basic program path information
@@ -48,27 +218,37 @@ if __name__ == "__main__":
 	progdir,progname = os.path.split(progpath)
 	
 	cachedefault = os.path.join(progdir,"cache")
+	sourcesdefault = os.path.join(progdir,"sources.ini")
 	
 	# setup argument parser and parse commandline arguments
 	parser = argparse.ArgumentParser(
 		description="Create a raster map from OpenStreetMap tiles.",
-		epilog="""Note: Besides a tile server URL scheme like 'http://host.tld/{z}/{x}/{y}.png',
+		epilog="""Note: Besides a tile server URL scheme like 'http://{s}.host.tld/{z}/{x}/{y}.png',
 the following keywords are also recognised: 'osm' (openstreetmap.de),
 'topo' (opentopomap.org), 'cycle' (opencyclemap.org),
 'tonerhybrid' (stamen.com), 'watercolor' (stamen.com),
 'hillshading' (wmflabs.org), 'seamark' (openseamap.org),
 'hybrid' (openmapsurfer.org), 'esri_topo' (arcgisonline.com),
 'esri_sat' (arcgisonline.com), 'esri_natgeo' (arcgisonline.com),
-'terrain' (stamen.com), dfs (ais.dfs.de)"""
+'terrain' (stamen.com), dfs (ais.dfs.de), as well as all sources
+defined in the source configuration file (cf. OSMSources.py)"""
 	)
 	parser.add_argument("--source",default="osm",help="URL scheme of a tile server; cf. note below")
+	parser.add_argument("--sources",help="source configuration file; default: "+sourcesdefault)
 	parser.add_argument("--cache",default=cachedefault,help="directory of the tile cache; default: "+cachedefault)
-	parser.add_argument("--delay",type=float,help="time in seconds between downloads")
+	parser.add_argument("--delay",type=float,help="time in seconds between downloads; overrides the rate limit of the source")
 	parser.add_argument("--quality",default=90,type=int,help="JPEG quality factor (integer, 0..95, default={0})".format(90))
 	parser.add_argument("--compression",default=9,type=int,help="PNG compression level (integer, 0..9, default={0})".format(9))
 	parser.add_argument("--infofile",help="write map information text to file INFOFILE")
-	parser.add_argument("--update",help="update tiles (download even if cached)",action="store_true")
-	parser.add_argument("ZOOM",type=int,help="zoom factor (0..18)")
+	parser.add_argument("--update",help="update tiles (download even if cached); only changed tiles are re-rendered",action="store_true")
+	parser.add_argument("--rebuild",help="render the whole map image even if a manifest of a previous run exists",action="store_true")
+	parser.add_argument("--width",type=int,help="scale and crop the map to a width of WIDTH pixels")
+	parser.add_argument("--height",type=int,help="scale and crop the map to a height of HEIGHT pixels")
+	parser.add_argument("--paper",help="scale and crop the map to fit paper size PAPER (A0..A6, letter, legal or WIDTHxHEIGHT in mm); requires --dpi")
+	parser.add_argument("--dpi",type=float,help="print resolution in dots per inch; used with --paper")
+	parser.add_argument("--landscape",help="use paper in landscape orientation",action="store_true")
+	parser.add_argument("--resample",default="lanczos",choices=sorted(RESAMPLE),help="filter used for scaling tiles (default=lanczos)")
+	parser.add_argument("ZOOM",type=int,help="zoom factor (0..18, or maximum zoom of the source)")
 	parser.add_argument("WEST",type=float,help="western boundary of the map (longitude in degrees)")
 	parser.add_argument("NORTH",type=float,help="northern boundary of the map (latitude in degrees)")
 	parser.add_argument("EAST",type=float,help="eastern boundary of the map (longitude in degrees)")
@@ -87,41 +267,25 @@ the following keywords are also recognised: 'osm' (openstreetmap.de),
 	if not os.path.exists(args.cache): os.mkdir(args.cache)
 	
 	# check tile server url ("source")
-	if args.source == "osm":
-		source = "http://tile.openstreetmap.de/tiles/osmde/{z}/{x}/{y}.png"
-	elif args.source == "topo":
-		source = "http://opentopomap.org/{z}/{x}/{y}.png"
-	elif args.source == "cycle":
-		source = "http://a.tile2.opencyclemap.org/transport/{z}/{x}/{y}.png"
-	elif args.source == "tonerhybrid":
-		source = "http://a.tile.stamen.com/toner-hybrid/{z}/{x}/{y}.png"
-	elif args.source == "watercolor":
-		source = "http://c.tile.stamen.com/watercolor/{z}/{x}/{y}.png"
-	elif args.source == "hillshading":
-		source = "http://c.tiles.wmflabs.org/hillshading/{z}/{x}/{y}.png"
-	elif args.source == "seamark":
-		source = "http://tiles.openseamap.org/seamark/{z}/{x}/{y}.png"
-	elif args.source == "hybrid":
-		source = "http://korona.geog.uni-heidelberg.de/tiles/hybrid/x={x}&y={y}&z={z}"
-	elif args.source == "esri_topo":
-		source = "https://services.arcgisonline.com/ArcGIS/rest/services/World_Topo_Map/MapServer/tile/{z}/{y}/{x}.jpg"
-	elif args.source == "esri_sat":
-		source = "https://server.arcgisonline.com/ArcGIS/rest/services/World_Imagery/MapServer/tile/{z}/{y}/{x}.jpg"
-	elif args.source == "esri_natgeo":
-		source = "https://services.arcgisonline.com/ArcGIS/rest/services/NatGeo_World_Map/MapServer/tile/{z}/{y}/{x}.jpg"
-	elif args.source == "terrain":
-		source = "https://stamen-tiles-d.a.ssl.fastly.net/terrain/{z}/{x}/{y}.png"
-	elif args.source == "dfs":
-		source = "https://ais.dfs.de/static-maps/icao500/tiles/{z}/{x}/{y}.png"
-		print("""WARNING!
-
-Always use the official ICAO charts published by the Deutsche Flugsicherung
-as basis for aeronautical navigation!
-
-YOU HAVE BEEN WARNED!
-""")
+	# the default configuration file is optional, an explicitly given one is not
+	if args.sources is None:
+		sourcesfile = sourcesdefault if os.path.exists(sourcesdefault) else None
+	elif os.path.exists(args.sources):
+		sourcesfile = args.sources
 	else:
-		source = args.source
+		print("Source configuration file '{0}' not found!".format(args.sources))
+		sys.exit(1)
+	try:
+		sources = OSMSources.loadSources(sourcesfile)
+	except (configparser.Error,ValueError) as e:
+		print("Invalid source configuration file: {0}".format(e))
+		sys.exit(1)
+	source = OSMSources.getSource(args.source,sources)
+	if source.warning:
+		print(source.warning)
+	if args.delay is not None and args.delay > 0:
+		# user-defined delay overrides the rate limit of the source
+		source.rate = 1 / args.delay
 	
 	# check bounding box values
 	if args.EAST <= args.WEST or args.NORTH <= args.SOUTH:
@@ -129,8 +293,8 @@ YOU HAVE BEEN WARNED!
 		sys.exit(1)
 	
 	# check zoom factor
-	if args.ZOOM < 0 or args.ZOOM > 18:
-		print("Invalid zoom factor!")
+	if args.ZOOM < 0 or args.ZOOM > source.maxzoom:
+		print("Invalid zoom factor! Source supports 0..{0}".format(source.maxzoom))
 		sys.exit(1)
 	
 	# upper left corner of map
@@ -145,65 +309,166 @@ YOU HAVE BEEN WARNED!
 	tiles = [(args.ZOOM,x,y) for x in range(x0,x1) for y in range(y0,y1)]
 	n     = len(tiles)
 	
-	# calculate image dimensions based on the standard 256x256 tile
-	w = (x1 - x0) * 256
-	h = (y1 - y0) * 256
+	# calculate image dimensions based on the tile size of the source
+	tilesize = source.tilesize
+	w = (x1 - x0) * tilesize
+	h = (y1 - y0) * tilesize
 	
-	# open map image file
-	img = PIL.Image.new("RGBA",(w,h))
+	# check for a target size; if given, the map is cropped exactly to the
+	# bounding box and each tile is scaled while it is pasted into the map
+	# image, so memory usage depends on the target size only
+	crop = None
+	if args.landscape and args.paper is None:
+		print("Invalid paper orientation! --landscape requires --paper.")
+		sys.exit(1)
+	if args.paper is not None and (args.width is not None or args.height is not None):
+		print("Invalid target size! Use either --paper or --width/--height.")
+		sys.exit(1)
+	if args.paper is not None or args.dpi is not None:
+		if args.paper is None or args.dpi is None or args.dpi <= 0:
+			print("Invalid paper size/resolution! Both --paper and --dpi are required.")
+			sys.exit(1)
+		try:
+			pw,ph = paperSize(args.paper,args.landscape)
+		except ValueError:
+			print("Invalid paper size '{0}'!".format(args.paper))
+			sys.exit(1)
+		boxw,boxh = pw * args.dpi / 25.4, ph * args.dpi / 25.4
+	else:
+		boxw,boxh = args.width,args.height
+	if boxw is not None or boxh is not None:
+		if (boxw is not None and boxw < 1) or (boxh is not None and boxh < 1):
+			print("Invalid target size!")
+			sys.exit(1)
+		crop = (
+			OSMTools.lon_to_x(args.WEST, args.ZOOM) * tilesize,
+			OSMTools.lat_to_y(args.NORTH,args.ZOOM) * tilesize,
+			OSMTools.lon_to_x(args.EAST, args.ZOOM) * tilesize,
+			OSMTools.lat_to_y(args.SOUTH,args.ZOOM) * tilesize,
+		)
+		# scale to fit the target box, keeping the aspect ratio of the map
+		scale = min(s for s in (
+			boxw / (crop[2] - crop[0]) if boxw is not None else None,
+			boxh / (crop[3] - crop[1]) if boxh is not None else None,
+		) if s is not None)
+		w = max(1,round((crop[2] - crop[0]) * scale))
+		h = max(1,round((crop[3] - crop[1]) * scale))
+		if scale > 1:
+			print("Warning: target size exceeds tile resolution, map will be upscaled.")
 	
-	# iterate over tiles
-	dfiles = 0
-	dbytes = 0
+	# determine cache path names and collect tiles which have to be downloaded
+	pathnames = dict()
+	downloads = list()
 	for i,(zoom,x,y) in enumerate(tiles):
 		
 		# parse tile URL
-		url = source.format(z=zoom,x=x,y=y)
+		url = source.cacheURL(zoom,x,y)
 		scheme,hostname,path,params,query,fragment = urllib.parse.urlparse(url)
 		if len(hostname) == 0 or len(path) == 0 or len(scheme) == 0:
 			print("invalid source URL specified!")
 			sys.exit(1)
 		pathname = os.path.join(args.cache,hostname,path[1:])
+		pathnames[zoom,x,y] = pathname
 		
-		# check if tile is already cached; download it otherwise
+		# check if tile is already cached; schedule download otherwise
 		if not args.update and os.path.exists(pathname):
 			print("{0}: {1}/{2} cached, skipping.".format(url,i+1,n))
 		else:
-			print("{0}: {1}/{2} downloading...".format(url,i+1,n),end="")
-			dirname,filename = os.path.split(pathname)
-			os.makedirs(dirname,exist_ok=True)
-			# control download rate
-			try:
-				time.sleep(args.delay)
-			except TypeError: # invalid delay, i.e. not specified: ignore
-				pass
-			
+			downloads.append((source.tileURL(zoom,x,y),pathname))
+	
+	# download tiles; number of parallel downloads and request rate are
+	# limited according to the source definition
+	dfiles = 0
+	dbytes = 0
+	with concurrent.futures.ThreadPoolExecutor(max_workers=source.concurrency) as executor:
+		futures = dict()
+		for url,pathname in downloads:
+			futures[executor.submit(downloadTile,source,url,pathname)] = url
+		for i,future in enumerate(concurrent.futures.as_completed(futures)):
+			prefix = "{0}: {1}/{2}".format(futures[future],i+1,len(downloads))
 			try:
-				imgbytes = urllib.request.urlopen(url).read()
-				if len(imgbytes) == 0:
-					raise TypeError
-				
-				with open(pathname,"wb") as f:
-					f.write(imgbytes)
-				print(" done ({0} {1})".format(*scaleBytes(len(imgbytes))))
-				dbytes = dbytes + len(imgbytes)
+				nbytes = future.result()
+				if nbytes is None:
+					print("{0} not modified.".format(prefix))
+					continue
+				print("{0} downloaded ({1} {2})".format(prefix,*scaleBytes(nbytes)))
+				dbytes = dbytes + nbytes
 				dfiles = dfiles + 1
 			except (urllib.error.URLError,ValueError):
-				print(" request failed!")
+				print("{0} request failed!".format(prefix))
 			except TypeError:
-				print(" no data was received!")
+				print("{0} no data was received!".format(prefix))
 			except ConnectionResetError:
-				print(" connection reset by peer!")
-		
-		# load tile image
+				print("{0} connection reset by peer!".format(prefix))
+	
+	# calculate content hashes of all tiles
+	hashes = dict()
+	for zoom,x,y in tiles:
 		try:
-			tileimg = PIL.Image.open(pathname)
-			# paste tile image to map image
-			img.paste(tileimg, (256 * (x - x0), 256 * (y - y0)))
+			hashes[zoom,x,y] = hashFile(pathnames[zoom,x,y])
 		except FileNotFoundError:
 			print("Error: tile zoom={zoom} x={x} y={y} not found!".format(zoom=zoom,x=x,y=y))
 			sys.exit(1)
 	
+	# compare with the manifest of a previous run: if the map image was created
+	# with the same parameters and was not modified since, only changed tiles
+	# have to be pasted into the existing image
+	manifestname = imgfilename + ".manifest"
+	parameters = {
+		"source": source.url,
+		"tilesize": tilesize,
+		"zoom": args.ZOOM,
+		"tiles": [x0,y0,x1,y1],
+		"dimensions": [w,h],
+		"crop": list(crop) if crop is not None else None,
+		"resample": args.resample if crop is not None else None,
+		"dpi": args.dpi,
+		"quality": args.quality,
+		"compression": args.compression,
+	}
+	manifest = None if args.rebuild else readManifest(manifestname)
+	changed = None
+	if manifest is not None and manifest["parameters"] == parameters:
+		try:
+			stat = os.stat(imgfilename)
+			if manifest["output"] == [stat.st_size,stat.st_mtime_ns]:
+				changed = [tile for tile in tiles if manifest["tiles"].get("{0}/{1}/{2}".format(*tile)) != hashes[tile]]
+		except OSError:
+			pass
+	
+	if changed is None:
+		# no usable manifest: render whole map image
+		img = PIL.Image.new("RGBA",(w,h))
+		render = tiles
+	elif len(changed) > 0:
+		# load existing map image and patch changed tiles
+		print("{0} of {1} tiles changed, updating map image.".format(len(changed),n))
+		with PIL.Image.open(imgfilename) as f:
+			img = f.copy()
+		render = changed
+	else:
+		print("No tiles changed, map image is up to date.")
+		img = None
+		render = list()
+	
+	# iterate over tiles
+	formats = (source.format,) if source.format else None
+	for zoom,x,y in render:
+		# load tile image and paste it to map image
+		with PIL.Image.open(pathnames[zoom,x,y],formats=formats) as tileimg:
+			if tileimg.size != (tilesize,tilesize):
+				print("Error: tile zoom={zoom} x={x} y={y}: tile size mismatch ({w}x{h} instead of {t}x{t})!".format(
+					zoom=zoom,x=x,y=y,w=tileimg.size[0],h=tileimg.size[1],t=tilesize))
+				sys.exit(1)
+			if crop is None:
+				img.paste(tileimg, (tilesize * (x - x0), tilesize * (y - y0)))
+				continue
+			placement = placeTile(x,y,tilesize,crop,(w,h))
+			if placement is None: continue
+			(left,top,right,bottom),box = placement
+			tileimg = tileimg.convert("RGBA").resize((right - left,bottom - top),RESAMPLE[args.resample],box=box)
+			img.paste(tileimg, (left,top))
+	
 	# end of tile stitching
 	
 	# print download statistics
@@ -216,20 +481,39 @@ YOU HAVE BEEN WARNED!
 			dfilestr = "{0} files".format(dfiles)
 		print("Downloads: {0}, {1} {2}".format(dfilestr,*scaleBytes(dbytes)))
 	
-	# save map image file
-	# unrecongnised parameters are silently ignored, so both JPEG and PNG
-	# quality parameters are provided...
-	img.save(args.FILE,quality=args.quality,compress_level=args.compression)
+	if img is not None:
+		# save map image file
+		# unrecongnised parameters are silently ignored, so both JPEG and PNG
+		# quality parameters are provided...
+		# the print resolution (if any) is stored in the file, so the image
+		# is printed/imported at the requested paper size
+		options = dict(quality=args.quality,compress_level=args.compression)
+		if args.dpi is not None: options["dpi"] = (args.dpi,args.dpi)
+		img.save(imgfilename,**options)
+		writeManifest(manifestname,parameters,imgfilename,hashes)
+	
+	# map extent in (fractional) tile coordinates and scale factor of the map
+	# image with respect to the tiles
+	if crop is None:
+		mx0,my0,mx1,my1 = x0,y0,x1,y1
+		pxscale = 1
+	else:
+		mx0,my0,mx1,my1 = [c / tilesize for c in crop]
+		pxscale = w / (crop[2] - crop[0])
 	
 	# calculate resolution
 	resolution = "   latitude     resolution\n"
 	latstep = (args.NORTH - args.SOUTH) / 5
 	for i in range(0,6):
 		lat = args.SOUTH + i * latstep
-		res = OSMTools.resolution(args.ZOOM,lat)
+		res = OSMTools.resolution(args.ZOOM,lat,tilesize) / pxscale
 		unit = 1
 		while unit/res < 1: unit = unit * 10
-		resolution = resolution + "   {0:8.5f}°    {1:.5f} m/px   {2:.5f} px/{3}m\n".format(lat,res,unit/res,unit)
+		resolution = resolution + "   {0:8.5f}°    {1:.5f} m/px   {2:.5f} px/{3}m".format(lat,res,unit/res,unit)
+		if args.dpi is not None:
+			# map scale when printed at given resolution
+			resolution = resolution + "   1:{0:.0f} at {1:g} dpi".format(res * args.dpi / 0.0254,args.dpi)
+		resolution = resolution + "\n"
 	
 	# prepare map information output
 	mapinfo = """----- Begin Map Image Information -----
@@ -240,6 +524,7 @@ General
    filename     {0}
    zoom         {1}
    dimensions   {2}x{3}
+   tile size    {16}x{16}
 
 Coordinates (Longitude,Latitude)
    upper left corner    {4},{5}
@@ -254,19 +539,22 @@ Resolution/Map Scale
 {15}
 
 addGrid Parameters
-   {1} {8} {9} {12} {13}
+   {1} {17} {18} {19} {20}
 ----- End Map Image Information -----
 """.format(
 		args.FILE,
 		args.ZOOM,
 		w,h,
-		OSMTools.x_to_lon(x0,args.ZOOM),OSMTools.y_to_lat(y0,args.ZOOM),
-		OSMTools.x_to_lon(x1,args.ZOOM),OSMTools.y_to_lat(y1,args.ZOOM),
+		OSMTools.x_to_lon(mx0,args.ZOOM),OSMTools.y_to_lat(my0,args.ZOOM),
+		OSMTools.x_to_lon(mx1,args.ZOOM),OSMTools.y_to_lat(my1,args.ZOOM),
 		x0,y0,
 		x1-1,y1-1,
 		x1-x0,y1-y0,
 		" ".join(sys.argv[1:]),
-		resolution
+		resolution,
+		tilesize,
+		mx0,my0,
+		mx1-mx0,my1-my0
 	)
 	
 	print(mapinfo)